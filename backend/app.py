@@ -1,5 +1,7 @@
 import asyncio
 import os
+from contextlib import asynccontextmanager
+from datetime import datetime
 from typing import Dict, List, Optional
 import uuid
 from fastapi import (
@@ -12,16 +14,20 @@ from fastapi import (
     File,
 )
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
 from dotenv import load_dotenv
+import aiofiles
+import hashlib
 import logging
 import tempfile
+from cachetools import TTLCache
 from pydantic import BaseModel
 import google.auth
 import google.auth.transport.requests
 from google.oauth2 import service_account
-import requests
-
-from flask import json
+import httpx
+import orjson
 
 from models import GameResponse
 from engine import GameEngine
@@ -31,7 +37,37 @@ from video_processor import VideoProcessor
 
 load_dotenv()
 
-app = FastAPI(title="Sensory Game Backend")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build heavy singletons at startup instead of import time, so importing
+    this module (tests, tooling) doesn't load models or open connections"""
+    # Pooled async HTTP client so outbound calls reuse connections and
+    # never block the event loop
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        timeout=30,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    )
+    app.state.video_processor = VideoProcessor()
+    app.state.llm_client = LLMClient(api_key=os.getenv("OPENAI_API_KEY"))
+    app.state.game_engine = GameEngine(app.state.llm_client, app.state.video_processor)
+    app.state.recording_manager = RecordingManager()
+
+    yield
+
+    logger.info("Application shutting down, cleaning up resources")
+    app.state.recording_manager.cleanup()
+    await app.state.http.aclose()
+
+
+# ORJSONResponse serializes every JSON endpoint with orjson instead of the
+# stdlib encoder
+app = FastAPI(
+    title="Sensory Game Backend",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -40,24 +76,85 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-video_processor = VideoProcessor()
-llm_client = LLMClient(api_key=os.getenv("OPENAI_API_KEY"))
-game_engine = GameEngine(llm_client, video_processor)
-recording_manager = RecordingManager()
-
 # Dictionary to store active WebSocket connections by game_id
 websocket_connections: Dict[str, WebSocket] = {}
 
+# In-flight recording-processing tasks by game_id, so cleanup can cancel
+# them instead of letting them run against a deleted session
+inflight_tasks: Dict[str, asyncio.Task] = {}
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _orjson_default(obj):
+    if isinstance(obj, BaseModel):
+        # mode="json" lets pydantic-core convert enums and friends in one
+        # Rust-side pass instead of a custom Python serializer
+        return obj.model_dump(mode="json")
+    raise TypeError
+
+
+async def send_ws_json(websocket: WebSocket, payload: dict):
+    """Send a payload as one text frame, serialized with orjson.
+
+    Pydantic models can be embedded directly in the payload; they are
+    serialized in place instead of being dumped to dicts first.
+    """
+    await websocket.send_text(orjson.dumps(payload, default=_orjson_default).decode())
+
+
 class TextToSpeechRequest(BaseModel):
     text: str
     npcId: str
     voiceOptions: dict
 
 
+# Refresh Google credentials this many seconds before they expire
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+
+# NPC lines repeat verbatim across sessions, so cache synthesized audio
+# keyed by (text, voice) for an hour instead of re-calling Google TTS
+tts_cache = TTLCache(maxsize=1024, ttl=3600)
+tts_cache_lock = asyncio.Lock()
+
+
+def _tts_cache_key(text: str, voice_name: str, language_code: str) -> bytes:
+    return hashlib.blake2b(
+        f"{text}|{voice_name}|{language_code}".encode(), digest_size=16
+    ).digest()
+
+
+async def get_tts_credentials():
+    """Return cached Google Cloud credentials, refreshing them when near expiry"""
+    credentials = getattr(app.state, "tts_credentials", None)
+
+    if credentials is None:
+        # Use a service account key file or Application Default Credentials
+        service_account_key = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+        if service_account_key:
+            credentials = service_account.Credentials.from_service_account_file(
+                service_account_key, scopes=["https://www.googleapis.com/auth/cloud-platform"]
+            )
+        else:
+            credentials, _ = google.auth.default(
+                scopes=["https://www.googleapis.com/auth/cloud-platform"]
+            )
+        app.state.tts_credentials = credentials
+
+    expires_soon = (
+        credentials.expiry is not None
+        and (credentials.expiry - datetime.utcnow()).total_seconds()
+        < TOKEN_REFRESH_MARGIN_SECONDS
+    )
+    if not credentials.valid or expires_soon:
+        # Token exchange is blocking network I/O, keep it off the event loop
+        auth_req = google.auth.transport.requests.Request()
+        await run_in_threadpool(credentials.refresh, auth_req)
+
+    return credentials
+
+
 @app.get("/")
 async def root():
     return {"status": "running", "service": "emotion-driven-game-backend"}
@@ -66,7 +163,7 @@ async def root():
 @app.delete("/game/{game_id}")
 async def end_game(game_id: str, background_tasks: BackgroundTasks):
     """End a game session and clean up resources"""
-    if game_id not in game_engine.game_sessions:
+    if not await app.state.game_engine.game_sessions.contains(game_id):
         raise HTTPException(status_code=404, detail=f"Game session {game_id} not found")
 
     # Clean up recording resources
@@ -77,22 +174,27 @@ async def end_game(game_id: str, background_tasks: BackgroundTasks):
 
 async def cleanup_game_resources(game_id: str):
     """Clean up resources for a game session"""
+    # Cancel any processing still running for this game so it doesn't
+    # touch the session or websocket after they're gone
+    task = inflight_tasks.pop(game_id, None)
+    if task is not None and not task.done():
+        task.cancel()
+
     # Clean up recording resources
-    recording_manager.cleanup(game_id)
+    app.state.recording_manager.cleanup(game_id)
 
     # Remove the game session from the engine
-    if game_id in game_engine.game_sessions:
-        del game_engine.game_sessions[game_id]
+    await app.state.game_engine.game_sessions.pop(game_id, None)
 
     # Close and remove the WebSocket connection if it exists
     if game_id in websocket_connections:
         try:
             await websocket_connections[game_id].close()
         except Exception as e:
-            logger.error(f"Error closing WebSocket for game {game_id}: {e}")
+            logger.error("Error closing WebSocket for game %s: %s", game_id, e)
         del websocket_connections[game_id]
 
-    logger.info(f"Cleaned up resources for game {game_id}")
+    logger.info("Cleaned up resources for game %s", game_id)
 
 
 @app.post("/recording/upload/{game_id}")
@@ -101,23 +203,39 @@ async def upload_recording(
 ):
     """Upload a video recording directly and process it"""
     try:
-        if game_id not in game_engine.game_sessions:
+        if not await app.state.game_engine.game_sessions.contains(game_id):
             raise HTTPException(status_code=404, detail=f"Game session {game_id} not found")
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as tmp_file:
-            content = await video.read()
-            tmp_file.write(content)
-            file_path = tmp_file.name
-
-        recording_result = recording_manager.handle_uploaded_file(game_id, file_path)
-
-        print(f"Processing recording for game {game_id}, file path: {recording_result.file_path}")
-        await process_recording(recording_result, game_id)
+        # Stream the upload to disk in chunks so a large video never has to
+        # fit in memory all at once; aiofiles keeps the disk writes off the
+        # event loop
+        fd, file_path = tempfile.mkstemp(suffix=".mp4")
+        os.close(fd)
+        async with aiofiles.open(file_path, "wb") as tmp_file:
+            while chunk := await video.read(1024 * 1024):
+                await tmp_file.write(chunk)
+
+        recording_result = app.state.recording_manager.handle_uploaded_file(game_id, file_path)
+
+        logger.info(
+            "Processing recording for game %s, file path: %s",
+            game_id,
+            recording_result.file_path,
+        )
+        task = asyncio.create_task(process_recording(recording_result, game_id))
+        inflight_tasks[game_id] = task
+        try:
+            await task
+        except asyncio.CancelledError:
+            logger.info("Processing for game %s was cancelled by cleanup", game_id)
+        finally:
+            if inflight_tasks.get(game_id) is task:
+                del inflight_tasks[game_id]
         # background_tasks.add_task(cleanup_temp_file, file_path)
 
         return {"status": "success", "message": "Video uploaded and processing started"}
     except Exception as e:
-        logger.error(f"Error processing uploaded video: {str(e)}")
+        logger.error("Error processing uploaded video: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -126,9 +244,9 @@ async def cleanup_temp_file(file_path: str):
     try:
         if os.path.exists(file_path):
             os.unlink(file_path)
-            logger.info(f"Temporary file {file_path} removed")
+            logger.info("Temporary file %s removed", file_path)
     except Exception as e:
-        logger.error(f"Error removing temporary file {file_path}: {str(e)}")
+        logger.error("Error removing temporary file %s: %s", file_path, e)
 
 
 async def process_recording(recording_result: RecordingResult, game_id: str):
@@ -136,22 +254,26 @@ async def process_recording(recording_result: RecordingResult, game_id: str):
 
     websocket = websocket_connections.get(game_id)
     if not websocket:
-        logger.warning(f"No active WebSocket connection for game {game_id}")
+        logger.warning("No active WebSocket connection for game %s", game_id)
         return
 
-    dialog_input, game_response = game_engine.process_recording(recording_result, game_id)
+    dialog_input, game_response = await app.state.game_engine.process_recording(
+        recording_result, game_id
+    )
 
     try:
         if dialog_input.sentences:
             for sentence in dialog_input.sentences:
-                await websocket.send_json(
+                await send_ws_json(
+                    websocket,
                     {
                         "user_dialog": sentence,
                     }
                 )
 
         if game_response.game_over:
-            await websocket.send_json(
+            await send_ws_json(
+                websocket,
                 {
                     "game_over": True,
                     "ending_type": game_response.ending_type.value,
@@ -160,24 +282,27 @@ async def process_recording(recording_result: RecordingResult, game_id: str):
                 }
             )
         if game_response.achievements:
-            await websocket.send_json(
+            await send_ws_json(
+                websocket,
                 {
-                    "achievement_unlocked": [
-                        ach.model_dump() for ach in game_response.achievements
-                    ],
+                    "achievement_unlocked": game_response.achievements,
                 }
             )
         if game_response.dialogs:
-            for dialog in game_response.dialogs:
-                await websocket.send_json(
-                    {
-                        "dialog": dialog.dialog,
-                        "npc_id": dialog.npc_id,
-                        "suspicion_level": game_response.suspicion_level,
-                    }
-                )
+            # Coalesce all NPC lines into one frame instead of a separate
+            # websocket message (serialization + syscall) per dialog
+            await send_ws_json(
+                websocket,
+                {
+                    "dialogs": [
+                        {"dialog": dialog.dialog, "npc_id": dialog.npc_id}
+                        for dialog in game_response.dialogs
+                    ],
+                    "suspicion_level": game_response.suspicion_level,
+                }
+            )
     except Exception as e:
-        logger.error(f"Error sending response to websocket for game {game_id}: {e}")
+        logger.error("Error sending response to websocket for game %s: %s", game_id, e)
 
 
 @app.websocket("/ws")
@@ -188,24 +313,24 @@ async def websocket_endpoint(websocket: WebSocket):
     try:
         while True:
             data = await websocket.receive_text()
-            payload = json.loads(data)
+            payload = orjson.loads(data)
             if payload.get("action") == "start":
-                game_id, initial_dialog = game_engine.create_new_game()
+                game_id, initial_dialog = await app.state.game_engine.create_new_game()
                 websocket_connections[game_id] = websocket
-                await websocket.send_json({"game_id": game_id})
-                await websocket.send_json({"dialog": initial_dialog})
+                await send_ws_json(websocket, {"game_id": game_id})
+                await send_ws_json(websocket, {"dialog": initial_dialog})
             elif payload.get("action") == "stop":
                 break
     except WebSocketDisconnect:
         # Remove the websocket connection when it's disconnected
-        logger.info(f"WebSocket connection closed for client")
+        logger.info("WebSocket connection closed for client")
 
 
 @app.get("/active-games")
 async def get_active_games():
     """Get all active game sessions"""
     return {
-        "active_games": list(game_engine.game_sessions.keys()),
+        "active_games": await app.state.game_engine.game_sessions.keys(),
         "active_connections": list(websocket_connections.keys()),
     }
 
@@ -213,7 +338,7 @@ async def get_active_games():
 @app.get("/game/{game_id}")
 async def get_game_details(game_id: str):
     """Get details for a specific game session"""
-    game_state = game_engine.get_game_state(game_id)
+    game_state = await app.state.game_engine.get_game_state(game_id)
     if not game_state:
         raise HTTPException(status_code=404, detail=f"Game session {game_id} not found")
 
@@ -223,45 +348,28 @@ async def get_game_details(game_id: str):
         "game_over": game_state.game_over,
         "suspicion_level": game_state.suspicion_level,
         "dialog_exchanges_count": game_state.dialog_exchanges_count,
-        "achievements": [ach.model_dump() for ach in game_state.achievements],
-        "npcs": [npc.model_dump() for npc in game_state.npcs],
+        "achievements": game_state.achievements,
+        "npcs": game_state.npcs,
         "has_websocket_connection": game_id in websocket_connections,
     }
 
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Event handler for application shutdown"""
-    logger.info("Application shutting down, cleaning up resources")
-    recording_manager.cleanup()
-
-
 @app.post("/api/synthesize-speech")
 async def synthesize_speech(request: TextToSpeechRequest):
     """Proxy requests to Google Text-to-Speech API"""
     try:
-        # Get Google Cloud credentials from environment
-        project_id = os.getenv("GOOGLE_PROJECT_ID")
-        print(f"Project ID: {project_id}")
-        # Use a service account key file or Application Default Credentials
-        # Option 1: Using service account key file
-        service_account_key = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-        if service_account_key:
-            credentials = service_account.Credentials.from_service_account_file(
-                service_account_key, scopes=["https://www.googleapis.com/auth/cloud-platform"]
-            )
-        else:
-            # Option 2: Use Application Default Credentials
-            credentials, project = google.auth.default(
-                scopes=["https://www.googleapis.com/auth/cloud-platform"]
-            )
+        voice_options = request.voiceOptions
+        cache_key = _tts_cache_key(
+            request.text, voice_options["name"], voice_options["languageCode"]
+        )
+        async with tts_cache_lock:
+            cached = tts_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-        # Make sure credentials are valid
-        auth_req = google.auth.transport.requests.Request()
-        credentials.refresh(auth_req)
+        credentials = await get_tts_credentials()
 
         # Prepare request to Google TTS API
-        voice_options = request.voiceOptions
         tts_request = {
             "input": {"text": request.text},
             "voice": {
@@ -276,23 +384,42 @@ async def synthesize_speech(request: TextToSpeechRequest):
             "Content-Type": "application/json",
         }
 
-        response = requests.post(
-            f"https://texttospeech.googleapis.com/v1/text:synthesize",
+        response = await app.state.http.post(
+            "https://texttospeech.googleapis.com/v1/text:synthesize",
             headers=headers,
             json=tts_request,
         )
 
-        if not response.ok:
+        if response.is_error:
             return {"error": {"message": f"TTS API error: {response.text}"}}
 
-        return response.json()
+        result = response.json()
+        async with tts_cache_lock:
+            tts_cache[cache_key] = result
+        return result
 
     except Exception as e:
-        logger.error(f"Error in text-to-speech: {str(e)}")
+        logger.error("Error in text-to-speech: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True)
+    # uvloop + httptools replace the pure-Python event loop and HTTP parser.
+    # Keep a single worker: game sessions and websocket connections live in
+    # process-local dicts, so multi-worker needs an external session store.
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        limit_concurrency=1000,
+        timeout_keep_alive=30,
+        ws_per_message_deflate=True,
+        ws_ping_interval=20,
+        ws_ping_timeout=20,
+        ws_max_size=16_777_216,
+        reload=False,
+    )
@@ -1,5 +1,7 @@
-from typing import Optional, Tuple, Dict
-import uuid
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import secrets
 import logging
 import time
 
@@ -8,16 +10,29 @@ from models import (
     NPC,
     Achievement,
     DialogInput,
+    DialogTurn,
     EndingType,
     GameResponse,
     GameState,
     LLMResponse,
+    NPCDialog,
 )
 from recording import RecordingResult
-from llm_client import LLMClient
+from llm_client import LLMClient, SUMMARY_COMPRESS_THRESHOLD
+from session_store import SessionStore
 
 logger = logging.getLogger(__name__)
 
+# How many finished games to keep around for post-mortem inspection
+FINISHED_SESSIONS_LIMIT = 32
+
+# Canned NPC line for turns with no speech and no emotional signal; these
+# turns are fully predictable, so they skip the LLM round-trip entirely
+SILENT_TURN_DIALOG = NPCDialog(
+    dialog="The hooded figures turn toward you, waiting. Your silence is noticed.",
+    npc_id="npc_sara",
+)
+
 
 class GameEngine:
     """
@@ -34,6 +49,7 @@ class GameEngine:
         self,
         llm_client: LLMClient,
         video_processor: VideoProcessor,
+        session_store: Optional[SessionStore] = None,
     ):
         """
         Initialize the game engine
@@ -41,20 +57,30 @@ class GameEngine:
         Args:
             llm_client: Client for communicating with the LLM API
             video_processor: Processor for analyzing video recordings
+            session_store: Store for active game sessions. Defaults to a new
+                SessionStore (Redis-backed when REDIS_URL is set).
         """
         self.llm_client = llm_client
         self.video_processor = video_processor
 
-        # Dictionary to store all active game sessions
-        self.game_sessions: Dict[str, GameState] = {}
+        # Store for all active game sessions
+        self.game_sessions: SessionStore = session_store or SessionStore()
+
+        # Small LRU of finished games so /game/{id} can still answer after
+        # the session has been evicted from the active store
+        self._finished: "OrderedDict[str, GameState]" = OrderedDict()
+
+        # In-flight background summary compressions, keyed by game id so a
+        # session never runs two at once
+        self._summary_tasks: Dict[str, asyncio.Task] = {}
 
         logger.info("Game engine initialized")
 
-    def get_game_state(self, game_id: str) -> Optional[GameState]:
+    async def get_game_state(self, game_id: str) -> Optional[GameState]:
         """Get the game state for a specific game ID"""
-        return self.game_sessions.get(game_id)
+        return await self.game_sessions.get(game_id) or self._finished.get(game_id)
 
-    def create_new_game(self) -> Tuple[str, str]:
+    async def create_new_game(self) -> Tuple[str, str]:
         """
         Create a new game session
 
@@ -62,7 +88,8 @@ class GameEngine:
             game_id: Unique identifier for the new game session
             initial_dialog: Initial dialog for the new game session
         """
-        game_id = str(uuid.uuid4())
+        # token_hex is a single urandom read with no UUID object construction
+        game_id = secrets.token_hex(8)
 
         initial_dialog = (
             "Welcome to the initiation, quickly! You need to drink the blood of the cult leader!"
@@ -73,7 +100,7 @@ class GameEngine:
             game_over=False,
             achievements=[],
             dialog_history=[
-                {"role": "system", "content": initial_dialog, "npc_id": "npc_cult_leader"},
+                DialogTurn(role="system", content=initial_dialog, npc_id="npc_cult_leader"),
             ],
             npcs=[
                 NPC(
@@ -101,16 +128,19 @@ class GameEngine:
         )
 
         # Store the new game session
-        self.game_sessions[game_id] = game_state
+        await self.game_sessions.set(game_id, game_state)
 
-        logger.info(f"Created new game session: {game_id}")
+        logger.info("Created new game session: %s", game_id)
         return game_id, initial_dialog
 
-    def process_recording(
+    async def process_recording(
         self, recording_result: RecordingResult, game_id: str
     ) -> Tuple[DialogInput, GameResponse]:
         """
-        Process the recording and send the results to the LLM
+        Process the recording and send the results to the LLM.
+
+        Async so the LLM calls of concurrent sessions overlap; the video
+        pipeline runs in a worker thread (backed by the shared process pool)
 
         Args:
             recording_result: The result of the recording
@@ -120,11 +150,11 @@ class GameEngine:
             GameResponse: Response containing dialog, game state and achievements
         """
         try:
-            game_state = self.get_game_state(game_id)
+            game_state = await self.get_game_state(game_id)
 
             if not game_state:
-                logger.error(f"Game session not found: {game_id}")
-                return GameResponse(
+                logger.error("Game session not found: %s", game_id)
+                return GameResponse.model_construct(
                     dialogs=[],
                     suspicion_level=0,
                     game_over=True,
@@ -134,15 +164,22 @@ class GameEngine:
                 )
 
             # Process the video
-            dialog_input = self.video_processor.process_video(recording_result.file_path)
-            game_state.dialog_history.append(
-                {"role": "user", "content": "\n".join(dialog_input.sentences)}
+            dialog_input = await asyncio.to_thread(
+                self.video_processor.process_video, recording_result.file_path
             )
 
+            # Silent, emotionless turns always get the same minor suspicion
+            # bump from the LLM; handle them deterministically instead of
+            # paying for a round-trip
+            if self._is_silent_turn(dialog_input):
+                return dialog_input, await self._silent_turn_response(game_state, game_id)
+
+            game_state.append_dialog(DialogTurn(role="user", content=dialog_input.text))
+
             # Increment dialog exchange counter since user has spoken
             game_state.dialog_exchanges_count += 1
 
-            llm_result: LLMResponse = self.llm_client.generate_response(
+            llm_result: LLMResponse = await self.llm_client.generate_response(
                 game_state=game_state,
                 dialog_input=dialog_input,
             )
@@ -151,39 +188,51 @@ class GameEngine:
             game_state.suspicion_level = llm_result.suspicion_level
             game_state.game_over = llm_result.is_game_over
             for dialog in llm_result.dialogs:
-                game_state.dialog_history.append(
-                    {
-                        "role": "system",
-                        "content": dialog.dialog,
-                        "npc_id": dialog.npc_id,
-                    }
+                game_state.append_dialog(
+                    DialogTurn(role="system", content=dialog.dialog, npc_id=dialog.npc_id)
                 )
 
             # Add new NPC if provided by LLM
             if llm_result.new_npc:
-                existing_npc_ids = [npc.id for npc in game_state.npcs]
-                if llm_result.new_npc.id not in existing_npc_ids:
+                if llm_result.new_npc.id not in game_state.npc_ids():
                     game_state.npcs.append(llm_result.new_npc)
-                    logger.info(f"Added new NPC: {llm_result.new_npc.id}")
+                    game_state.invalidate_npcs_dump()
+                    logger.info("Added new NPC: %s", llm_result.new_npc.id)
 
-            # Process dynamic achievements from LLM response
+            # Process dynamic achievements from LLM response, skipping any
+            # the player already earned (set lookup instead of list scans)
             new_achievements = []
             if llm_result.achievement_unlocked:
+                earned_names = set(game_state.achievement_names)
                 for ach in llm_result.achievement_unlocked:
+                    if ach.name in earned_names:
+                        continue
                     new_ach = Achievement(
                         name=ach.name,
                         description=ach.description,
                     )
                     game_state.achievements.append(new_ach)
                     new_achievements.append(new_ach)
+                    earned_names.add(new_ach.name)
 
-            # Clean up finished games after a while to prevent memory leaks
+            # Persist the updated state so other workers see this turn
+            await self.game_sessions.set(game_id, game_state)
+
+            # Keep the rolling summary bounded without delaying this turn;
+            # the result is written back through the store when it lands
+            if not game_state.game_over:
+                self._maybe_compress_summary(game_state)
+
+            # Evict finished games from the active store so sessions don't
+            # accumulate forever; keep a bounded LRU for post-mortems
             if game_state.game_over:
-                # In a real implementation, you might want to schedule this for later
-                # or use a separate cleanup routine that runs periodically
-                logger.info(f"Game {game_id} is over, will be removed from active sessions soon")
+                await self.game_sessions.pop(game_id, None)
+                self._finished[game_id] = game_state
+                while len(self._finished) > FINISHED_SESSIONS_LIMIT:
+                    self._finished.popitem(last=False)
+                logger.info("Game %s is over, removed from active sessions", game_id)
 
-            response = GameResponse(
+            response = GameResponse.model_construct(
                 dialogs=llm_result.dialogs,
                 suspicion_level=llm_result.suspicion_level,
                 game_over=llm_result.is_game_over,
@@ -194,8 +243,8 @@ class GameEngine:
 
             return dialog_input, response
         except Exception as e:
-            logger.error(f"Error processing recording for game {game_id}: {e}")
-            return DialogInput(sentences=[], video_file=""), GameResponse(
+            logger.error("Error processing recording for game %s: %s", game_id, e)
+            return DialogInput(video_file="", emotion_results=[]), GameResponse.model_construct(
                 dialogs=[],
                 suspicion_level=0,
                 game_over=True,
@@ -203,3 +252,79 @@ class GameEngine:
                 achievements=[],
                 analysis=str(e),
             )
+
+    def _maybe_compress_summary(self, game_state: GameState) -> None:
+        """
+        Kick off a background compression of the rolling history summary once
+        it grows past the threshold. Fire-and-forget: the turn in flight is
+        never delayed, and a session runs at most one compression at a time.
+        """
+        if len(game_state.history_summary) < SUMMARY_COMPRESS_THRESHOLD:
+            return
+        if game_state.game_id in self._summary_tasks:
+            return
+        task = asyncio.create_task(
+            self._compress_and_persist(game_state.game_id, game_state.history_summary)
+        )
+        self._summary_tasks[game_state.game_id] = task
+        task.add_done_callback(
+            lambda _: self._summary_tasks.pop(game_state.game_id, None)
+        )
+
+    async def _compress_and_persist(self, game_id: str, raw_summary: str) -> None:
+        """
+        Compress a summary snapshot and write it back through the session
+        store, so the result also survives backends without object aliasing
+        (Redis). The state is re-fetched after the LLM call: turns finished
+        while compressing may have appended to the summary, and only the
+        snapshot prefix is replaced.
+        """
+        compressed = await self.llm_client.compress_summary(raw_summary)
+        if compressed is None:
+            return
+
+        game_state = await self.game_sessions.get(game_id)
+        if game_state is None or not game_state.history_summary.startswith(raw_summary):
+            return
+
+        game_state.history_summary = (
+            compressed + game_state.history_summary[len(raw_summary):]
+        )
+        await self.game_sessions.set(game_id, game_state)
+
+    @staticmethod
+    def _is_silent_turn(dialog_input: DialogInput) -> bool:
+        """A turn with no speech and only neutral emotions carries no signal"""
+        return not dialog_input.sentences and all(
+            e.get_dominant_emotion() == "neutral" for e in dialog_input.emotions
+        )
+
+    async def _silent_turn_response(self, game_state: GameState, game_id: str) -> GameResponse:
+        """
+        Deterministic response for silent turns: bump suspicion and have an
+        NPC call the silence out, without an LLM call. Reaching maximum
+        suspicion still ends the game, matching the scenario rules.
+        """
+        game_state.suspicion_level = min(game_state.suspicion_level + 1, 10)
+        game_state.dialog_exchanges_count += 1
+        game_state.append_dialog(
+            DialogTurn(
+                role="system",
+                content=SILENT_TURN_DIALOG.dialog,
+                npc_id=SILENT_TURN_DIALOG.npc_id,
+            )
+        )
+
+        game_over = game_state.suspicion_level >= 10
+        game_state.game_over = game_over
+        await self.game_sessions.set(game_id, game_state)
+        logger.info("Silent turn for game %s, skipped LLM call", game_id)
+
+        return GameResponse.model_construct(
+            dialogs=[SILENT_TURN_DIALOG],
+            suspicion_level=game_state.suspicion_level,
+            game_over=game_over,
+            ending_type=EndingType.FAILURE if game_over else None,
+            achievements=[],
+            analysis="Your cover was blown by staying silent too long." if game_over else None,
+        )
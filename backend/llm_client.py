@@ -1,11 +1,24 @@
-import json
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any
-from openai import OpenAI
+from dataclasses import dataclass
+import fastjsonschema
+import httpx
+from cachetools import TTLCache
+import orjson
+from typing import Dict, Any, Optional
+from openai import APIConnectionError, APITimeoutError, AsyncOpenAI, RateLimitError
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 
 from models import (
     Achievement,
     DialogInput,
+    EndingType,
     GameState,
     LLMResponse,
     NPC,
@@ -14,195 +27,19 @@ from models import (
 
 logger = logging.getLogger(__name__)
 
+# Process-wide pooled transport shared by every LLMClient so keep-alive
+# TCP/TLS sessions are reused instead of re-handshaking per client init
+_SHARED_HTTP = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(
+        max_keepalive_connections=64, max_connections=128, keepalive_expiry=60
+    ),
+    timeout=httpx.Timeout(30.0, connect=5.0),
+)
 
-class LLMClient:
-    """Client for interacting with LLM APIs (e.g., OpenAI)"""
-
-    def __init__(self, api_key: str, model: str = "gpt-4o-mini"):
-        """
-        Initialize the LLM client
-
-        Args:
-            api_key: API key for the LLM service
-            model: Model to use for generating responses
-        """
-        self.api_key = api_key
-        self.client = OpenAI(api_key=api_key, base_url="https://proxy.merkulov.ai")
-        self.model = model
-
-        logger.info(f"LLM client initialized with model {model}")
-
-    def generate_response(
-        self,
-        game_state: GameState,
-        dialog_input: DialogInput,
-    ) -> LLMResponse:
-        """
-        Generate a game response based on the current state and user inputs
-
-        Args:
-            game_state: Current game state including scenario and history
-            dialog_input: User's speech and emotional data
-
-        Returns:
-            Response containing dialog and game state updates
-        """
-        try:
-            print("File: ", dialog_input.video_file)
-            print("Emotions: ", [e.to_dict() for e in dialog_input.emotions])
-            print("Sentences: ", dialog_input.sentences)
-
-            context = self._build_context(game_state, dialog_input)
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self._get_system_prompt()},
-                    {"role": "user", "content": json.dumps(context)},
-                ],
-                functions=[
-                    {
-                        "name": "generate_response",
-                        "description": "Generate the NPC's next response and update the game state",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "dialogs": {
-                                    "type": "array",
-                                    "description": "The NPC's next line of dialog",
-                                    "items": {
-                                        "type": "object",
-                                        "properties": {
-                                            "dialog": {
-                                                "type": "string",
-                                                "description": "The NPC's next line of dialog",
-                                            },
-                                            "npc_id": {
-                                                "type": "string",
-                                                "description": "The ID of the NPC that is speaking",
-                                            },
-                                        },
-                                        "required": ["dialog", "npc_id"],
-                                    },
-                                },
-                                "suspicion_level": {
-                                    "type": "number",
-                                    "description": "Current suspicion level (0-10)",
-                                },
-                                "continue_story": {
-                                    "type": "boolean",
-                                    "description": "Whether the game should continue",
-                                },
-                                "ending_type": {
-                                    "type": "string",
-                                    "enum": ["success", "failure", "error", None],
-                                    "description": "Type of ending if game is over",
-                                },
-                                "achievement_unlocked": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "object",
-                                        "properties": {
-                                            "name": {
-                                                "type": "string",
-                                                "description": "Name of the dynamically generated achievement",
-                                            },
-                                            "description": {
-                                                "type": "string",
-                                                "description": "Description of what the player did to earn this achievement",
-                                            },
-                                        },
-                                        "required": ["name", "description"],
-                                    },
-                                    "description": "Dynamically generated achievements based on the player's actions and emotions",
-                                },
-                                "analysis": {
-                                    "type": "string",
-                                    "description": "Analysis of the game when it's over, what the player did well and what they could have done better",
-                                    "nullable": True,
-                                },
-                                "new_npc": {
-                                    "type": "object",
-                                    "properties": {
-                                        "id": {
-                                            "type": "string",
-                                            "description": "Unique identifier for the NPC",
-                                        },
-                                        "description": {
-                                            "type": "string",
-                                            "description": "Physical description of the NPC",
-                                        },
-                                    },
-                                    "required": ["id", "description"],
-                                    "description": "Add a new NPC to the game",
-                                    "nullable": True,
-                                },
-                            },
-                            "required": ["dialog", "npc_id", "suspicion_level", "continue_story"],
-                        },
-                    }
-                ],
-                function_call={"name": "generate_response"},
-                temperature=0.2,
-            )
-
-            function_call = response.choices[0].message.function_call
-
-            if function_call and function_call.name == "generate_response":
-                result = json.loads(function_call.arguments)
-                print("Result: ", result)
-                print("Context: ", context)
-
-                # Process new NPC if provided
-                new_npc = None
-                if result.get("new_npc"):
-                    new_npc = NPC(
-                        id=result["new_npc"]["id"],
-                        description=result["new_npc"]["description"],
-                        role=result["new_npc"]["role"],
-                    )
-
-                return LLMResponse(
-                    dialogs=[
-                        NPCDialog(dialog=d["dialog"], npc_id=d["npc_id"]) for d in result["dialogs"]
-                    ],
-                    suspicion_level=result["suspicion_level"],
-                    continue_story=result["continue_story"],
-                    ending_type=result.get("ending_type", None),
-                    achievement_unlocked=[
-                        Achievement(
-                            name=ach["name"],
-                            description=ach["description"],
-                        )
-                        for ach in result.get("achievement_unlocked", [])
-                    ],
-                    analysis=result.get("analysis", None),
-                    new_npc=new_npc,
-                )
-            else:
-                logger.warning("Function calling failed, using fallback")
-                return LLMResponse(
-                    dialogs=[],
-                    suspicion_level=5,
-                    continue_story=True,
-                    ending_type=None,
-                    achievement_unlocked=None,
-                    new_npc=None,
-                )
-
-        except Exception as e:
-            logger.error(f"Error in LLM API call: {str(e)}")
-            return LLMResponse(
-                dialogs=[],
-                suspicion_level=7,
-                continue_story=True,
-                ending_type=None,
-                achievement_unlocked=None,
-                new_npc=None,
-            )
-
-    def _get_system_prompt(self) -> str:
-        """Get the system prompt for the LLM"""
-        return """
+# Static prompt pieces are module-level constants and sent byte-identical on
+# every call so the provider can reuse its prompt/KV cache for the prefix
+_SYSTEM_PROMPT = """
 You are an AI controlling a *cult ritual* scenario in a game. The player is an *undercover agent* with no prior knowledge of the situation. Their mission is to stay undercover, uncover their objective, and complete it without raising suspicion.
 
 ACT 1: ARRIVAL (1 dialog exchange)
@@ -304,6 +141,552 @@ Only give achievements when the player does something noteworthy.
 }
 """
 
+@dataclass(frozen=True, slots=True)
+class Scenario:
+    """Immutable bundle of the scenario-specific prompt pieces, so new
+    scenarios are a constant rather than another LLMClient variant"""
+
+    name: str
+    system_prompt: str
+
+
+CULT_SCENARIO = Scenario(name="cult", system_prompt=_SYSTEM_PROMPT)
+
+# Built once at import; strict mode gives server-side constrained decoding,
+# so the returned arguments are guaranteed to match this schema
+_RESPONSE_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "generate_response",
+        "description": "Generate the NPC's next response and update the game state",
+        "strict": True,
+        "parameters": {
+            "type": "object",
+            "additionalProperties": False,
+            "properties": {
+                "dialogs": {
+                    "type": "array",
+                    "description": "The NPC dialog lines for this turn",
+                    "items": {
+                        "type": "object",
+                        "additionalProperties": False,
+                        "properties": {
+                            "dialog": {
+                                "type": "string",
+                                "description": "The NPC's next line of dialog",
+                            },
+                            "npc_id": {
+                                "type": "string",
+                                "description": "The ID of the NPC that is speaking",
+                            },
+                        },
+                        "required": ["dialog", "npc_id"],
+                    },
+                },
+                "suspicion_level": {
+                    "type": "number",
+                    "description": "Current suspicion level (0-10)",
+                },
+                "continue_story": {
+                    "type": "boolean",
+                    "description": "Whether the game should continue",
+                },
+                "ending_type": {
+                    "type": ["string", "null"],
+                    "enum": ["success", "failure", "error", None],
+                    "description": "Type of ending if game is over",
+                },
+                "achievement_unlocked": {
+                    "type": ["array", "null"],
+                    "items": {
+                        "type": "object",
+                        "additionalProperties": False,
+                        "properties": {
+                            "name": {
+                                "type": "string",
+                                "description": "Name of the dynamically generated achievement",
+                            },
+                            "description": {
+                                "type": "string",
+                                "description": "Description of what the player did to earn this achievement",
+                            },
+                        },
+                        "required": ["name", "description"],
+                    },
+                    "description": "Dynamically generated achievements based on the player's actions and emotions",
+                },
+                "analysis": {
+                    "type": ["string", "null"],
+                    "description": "Analysis of the game when it's over, what the player did well and what they could have done better",
+                },
+                "new_npc": {
+                    "type": ["object", "null"],
+                    "additionalProperties": False,
+                    "properties": {
+                        "id": {
+                            "type": "string",
+                            "description": "Unique identifier for the NPC",
+                        },
+                        "description": {
+                            "type": "string",
+                            "description": "Physical description of the NPC",
+                        },
+                        "role": {
+                            "type": "string",
+                            "description": "Role of the NPC in the story",
+                        },
+                    },
+                    "required": ["id", "description", "role"],
+                    "description": "Add a new NPC to the game",
+                },
+            },
+            "required": [
+                "dialogs",
+                "suspicion_level",
+                "continue_story",
+                "ending_type",
+                "achievement_unlocked",
+                "analysis",
+                "new_npc",
+            ],
+        },
+    },
+}
+
+_RESPONSE_TOOL_CHOICE = {"type": "function", "function": {"name": "generate_response"}}
+
+# Compiled once at import; validates a decoded response in microseconds and
+# guards the model_construct path against a provider that ignores strict mode
+_VALIDATE_RESPONSE = fastjsonschema.compile(_RESPONSE_TOOL["function"]["parameters"])
+
+
+# Cap on memoized LLM responses; identical contexts recur mostly in the
+# first few turns of new sessions, so a small cache with a TTL is enough
+RESPONSE_CACHE_SIZE = 256
+RESPONSE_CACHE_TTL_SECONDS = 3600
+
+# Cap on simultaneous in-flight LLM requests per client, so large gather
+# fanouts don't trip provider rate limits or hog the connection pool
+LLM_MAX_CONCURRENCY = 32
+
+# The scenario reaches Act 3 (the climax) on the third exchange; route those
+# turns to the stronger model, everything else to the fast default
+CLIMAX_EXCHANGE_THRESHOLD = 3
+
+# Compress the rolling history summary once it grows past this many
+# characters, so long sessions don't slowly inflate the prompt again
+SUMMARY_COMPRESS_THRESHOLD = 4000
+
+_SUMMARY_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": (
+        "Summarize the following game dialog log into one short paragraph. "
+        "Keep plot-relevant facts, suspicion changes and promises made. "
+        "Reply with the summary only."
+    ),
+}
+
+_ACHIEVEMENT_SCORING_MESSAGE = {
+    "role": "system",
+    "content": (
+        "You review finished game sessions of the cult-ritual scenario. "
+        "Given a session log, award creative achievements following the same "
+        "guidelines as the live game: unique, witty, and specific to what "
+        "the player did. Respond with a JSON array of "
+        '{"name": ..., "description": ...} objects (possibly empty).'
+    ),
+}
+
+# Prefill budget (in tokens) for raw history turns per request, and the
+# rough chars-per-token ratio used to estimate turn cost without pulling in
+# a tokenizer dependency
+HISTORY_TOKEN_BUDGET = 2000
+_CHARS_PER_TOKEN = 4
+# Fixed overhead per turn for the role/npc_id keys and JSON punctuation
+_TURN_TOKEN_OVERHEAD = 8
+
+# Pre-built fallback responses for the sad paths, so outages don't pay for
+# validation on every failed call; handed out as copies since callers get
+# their own instance
+_FALLBACK_WARNING = LLMResponse(
+    dialogs=[],
+    suspicion_level=5,
+    continue_story=True,
+    ending_type=None,
+    achievement_unlocked=None,
+    new_npc=None,
+)
+_FALLBACK_ERROR = LLMResponse(
+    dialogs=[],
+    suspicion_level=7,
+    continue_story=True,
+    ending_type=None,
+    achievement_unlocked=None,
+    new_npc=None,
+)
+
+
+class LLMClient:
+    """Client for interacting with LLM APIs (e.g., OpenAI)"""
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gpt-4o-mini",
+        climax_model: str = "gpt-4o",
+        scenario: Scenario = CULT_SCENARIO,
+    ):
+        """
+        Initialize the LLM client
+
+        Args:
+            api_key: API key for the LLM service
+            model: Model to use for generating responses
+            climax_model: Stronger model reserved for Act 3 turns
+            scenario: Scenario whose prompt this client plays
+        """
+        self.api_key = api_key
+        self.scenario = scenario
+        # Built once so the prompt prefix stays byte-identical across calls
+        self._system_message = {"role": "system", "content": scenario.system_prompt}
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            base_url="https://proxy.merkulov.ai",
+            http_client=_SHARED_HTTP,
+        )
+        self.model = model
+        self.climax_model = climax_model
+
+        # TTL-bounded cache of context-hash -> LLMResponse so repeated game
+        # situations (e.g. the scripted Act 1 exchange) skip the API
+        # round-trip, while stale entries age out on their own
+        self._response_cache: TTLCache = TTLCache(
+            maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL_SECONDS
+        )
+
+        # Gate on concurrent API calls so batch fanouts stay within limits
+        self._semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
+        logger.info("LLM client initialized with model %s", model)
+
+    def _route_model(self, game_state: GameState) -> str:
+        """
+        Pick the model for this turn: the fast default for the scripted early
+        acts, the stronger climax model once the Act 3 loyalty test starts.
+        """
+        if game_state.dialog_exchanges_count >= CLIMAX_EXCHANGE_THRESHOLD:
+            return self.climax_model
+        return self.model
+
+    def _cache_key(self, context: Dict[str, Any]) -> str:
+        """Stable hash of the request context"""
+        canonical = orjson.dumps(context, option=orjson.OPT_SORT_KEYS)
+        return hashlib.blake2b(canonical, digest_size=16).hexdigest()
+
+    def _cache_get(self, key: str):
+        cached = self._response_cache.get(key)
+        if cached is None:
+            return None
+        return cached.model_copy(deep=True)
+
+    def _cache_put(self, key: str, response: "LLMResponse"):
+        self._response_cache[key] = response.model_copy(deep=True)
+
+    async def generate_response(
+        self,
+        game_state: GameState,
+        dialog_input: DialogInput,
+        speaker_npc_id: "str | None" = None,
+    ) -> LLMResponse:
+        """
+        Generate a game response based on the current state and user inputs.
+
+        Async so concurrent game sessions overlap their LLM round-trips
+        instead of serializing on one in-flight request.
+
+        Args:
+            game_state: Current game state including scenario and history
+            dialog_input: User's speech and emotional data
+            speaker_npc_id: If set, ask the model to answer as this NPC
+
+        Returns:
+            Response containing dialog and game state updates
+        """
+        try:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "LLM input: file=%s sentences=%s",
+                    dialog_input.video_file,
+                    dialog_input.sentences,
+                )
+
+            context = self._build_context(game_state, dialog_input)
+            if speaker_npc_id:
+                context["respond_as_npc"] = speaker_npc_id
+            roster_message = self._build_roster_message(game_state)
+            model = self._route_model(game_state)
+
+            cache_key = self._cache_key(
+                {"model": model, "roster": roster_message["content"], "context": context}
+            )
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                logger.info("LLM response cache hit")
+                return cached
+
+            function_name, arguments = await self._call_llm(
+                model,
+                [
+                    self._system_message,
+                    roster_message,
+                    {"role": "user", "content": orjson.dumps(context).decode()},
+                ],
+            )
+
+            result = None
+            if function_name == "generate_response" and arguments:
+                try:
+                    result = _VALIDATE_RESPONSE(orjson.loads(arguments))
+                except (orjson.JSONDecodeError, fastjsonschema.JsonSchemaException) as e:
+                    logger.warning("LLM response failed schema validation: %s", e)
+
+            if result is not None:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("LLM result: %s (context: %s)", result, context)
+
+                # The strict tool schema already guarantees the shape of the
+                # payload, so build the models with model_construct and skip
+                # a second round of pydantic validation
+                new_npc = None
+                if result.get("new_npc"):
+                    new_npc = NPC.model_construct(
+                        id=result["new_npc"]["id"],
+                        description=result["new_npc"]["description"],
+                        role=result["new_npc"]["role"],
+                    )
+
+                ending_type = result.get("ending_type")
+                llm_response = LLMResponse.model_construct(
+                    dialogs=[
+                        NPCDialog.model_construct(dialog=d["dialog"], npc_id=d["npc_id"])
+                        for d in result["dialogs"]
+                    ],
+                    suspicion_level=int(result["suspicion_level"]),
+                    continue_story=result["continue_story"],
+                    ending_type=EndingType(ending_type) if ending_type else None,
+                    achievement_unlocked=[
+                        Achievement.model_construct(
+                            name=ach["name"],
+                            description=ach["description"],
+                        )
+                        for ach in result.get("achievement_unlocked") or []
+                    ],
+                    analysis=result.get("analysis", None),
+                    new_npc=new_npc,
+                )
+                self._cache_put(cache_key, llm_response)
+                return llm_response
+            else:
+                logger.warning("Function calling failed, using fallback")
+                return _FALLBACK_WARNING.model_copy()
+
+        except Exception as e:
+            logger.error("Error in LLM API call: %s", e)
+            return _FALLBACK_ERROR.model_copy()
+
+    async def generate_responses_batch(
+        self, pairs: "list[tuple[GameState, DialogInput]]"
+    ) -> "list[LLMResponse]":
+        """
+        Generate responses for several independent game turns concurrently.
+
+        The per-turn calls are independent, so fanning out with gather makes
+        the wall time for a batch track the slowest call instead of the sum.
+
+        Args:
+            pairs: (game_state, dialog_input) tuples, one per turn
+
+        Returns:
+            LLMResponse per pair, in the same order
+        """
+        return await asyncio.gather(
+            *(
+                self.generate_response(game_state=game_state, dialog_input=dialog_input)
+                for game_state, dialog_input in pairs
+            )
+        )
+
+    @retry(
+        wait=wait_exponential_jitter(initial=0.5, max=8),
+        stop=stop_after_attempt(4),
+        retry=retry_if_exception_type(
+            (RateLimitError, APITimeoutError, APIConnectionError)
+        ),
+        reraise=True,
+    )
+    async def _call_llm(self, model: str, messages: list) -> "tuple[str | None, str]":
+        """
+        One attempt of the streamed tool call, consuming argument deltas as
+        they arrive so transfer overlaps generation. Transient provider
+        failures (429s, timeouts, dropped connections) are retried with
+        jittered exponential backoff before the caller's fallback kicks in.
+        The semaphore bounds total in-flight requests across all fanouts.
+        """
+        async with self._semaphore:
+            return await self._call_llm_inner(model, messages)
+
+    async def _call_llm_inner(self, model: str, messages: list) -> "tuple[str | None, str]":
+        response = await self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            tools=[_RESPONSE_TOOL],
+            tool_choice=_RESPONSE_TOOL_CHOICE,
+            # Deterministic sampling makes the call a pure function of its
+            # context, so identical turns hit the response cache
+            temperature=0.0,
+            top_p=1.0,
+            seed=42,
+            stream=True,
+        )
+
+        function_name = None
+        argument_parts = []
+        async for chunk in response:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta and delta.tool_calls:
+                tool_call = delta.tool_calls[0]
+                if tool_call.function:
+                    if tool_call.function.name:
+                        function_name = tool_call.function.name
+                    if tool_call.function.arguments:
+                        argument_parts.append(tool_call.function.arguments)
+        return function_name, "".join(argument_parts)
+
+    async def generate_responses_for_npcs(
+        self,
+        game_state: GameState,
+        dialog_input: DialogInput,
+        npc_ids: "list[str]",
+    ) -> "list[LLMResponse]":
+        """
+        Get a reaction from each listed NPC concurrently (e.g. cult members
+        responding in a round). Decoding time is linear in output tokens, so
+        N short parallel calls finish in ~max latency rather than the sum a
+        single N-NPC prompt would decode serially.
+
+        Args:
+            game_state: Current game state shared by all reactions
+            dialog_input: User's speech and emotional data
+            npc_ids: NPCs that should each produce a response
+
+        Returns:
+            LLMResponse per NPC id, in the same order
+        """
+        return await asyncio.gather(
+            *(
+                self.generate_response(
+                    game_state=game_state,
+                    dialog_input=dialog_input,
+                    speaker_npc_id=npc_id,
+                )
+                for npc_id in npc_ids
+            )
+        )
+
+    async def enqueue_achievement_scoring(self, session_logs: "list[dict]") -> str:
+        """
+        Submit retroactive achievement scoring of finished sessions through
+        the OpenAI Batch API. Offline scoring has no latency requirement and
+        batch processing is billed at half price, so it never competes with
+        live dialog turns for rate limits.
+
+        Args:
+            session_logs: One dict per finished session (game_id, dialog
+                history, achievements already earned, ...)
+
+        Returns:
+            The id of the created batch, for later polling
+        """
+        lines = [
+            orjson.dumps(
+                {
+                    "custom_id": str(log.get("game_id", idx)),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self.model,
+                        "messages": [
+                            _ACHIEVEMENT_SCORING_MESSAGE,
+                            {
+                                "role": "user",
+                                "content": orjson.dumps(
+                                    log, option=orjson.OPT_SORT_KEYS
+                                ).decode(),
+                            },
+                        ],
+                        "temperature": 0.0,
+                    },
+                }
+            )
+            for idx, log in enumerate(session_logs)
+        ]
+
+        input_file = await self.client.files.create(
+            file=("achievement_scoring.jsonl", b"\n".join(lines) + b"\n"),
+            purpose="batch",
+        )
+        batch = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        logger.info(
+            "Enqueued achievement scoring batch %s (%d sessions)",
+            batch.id,
+            len(session_logs),
+        )
+        return batch.id
+
+    async def compress_summary(self, history_summary: str) -> Optional[str]:
+        """
+        Compress an accumulated raw history summary into a short paragraph.
+
+        Returns the compressed text, or None if compression failed. Scheduling
+        and persistence are owned by the GameEngine, which writes the result
+        back through the session store.
+        """
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    _SUMMARY_SYSTEM_MESSAGE,
+                    {"role": "user", "content": history_summary},
+                ],
+                temperature=0.0,
+            )
+            summary = response.choices[0].message.content
+            if summary:
+                return summary.strip() + "\n"
+        except Exception as e:
+            logger.warning("Summary compression failed: %s", e)
+        return None
+
+    def _build_roster_message(self, game_state: GameState) -> Dict[str, str]:
+        """
+        Build the NPC roster as its own system message.
+
+        The roster changes at most a few times per session, so keeping it out
+        of the per-turn user message leaves a longer byte-identical prefix for
+        provider-side prompt caching.
+        """
+        roster = game_state.npcs_dump()
+        return {
+            "role": "system",
+            "content": "NPC roster:\n" + orjson.dumps(roster, option=orjson.OPT_SORT_KEYS).decode(),
+        }
+
     def _build_context(
         self,
         game_state: GameState,
@@ -311,13 +694,23 @@ Only give achievements when the player does something noteworthy.
     ) -> Dict[str, Any]:
         """Build the context object for the LLM API call"""
 
-        trimmed_dialog_history = game_state.dialog_history[-10:]
+        # Greedily take turns from the tail until the token budget runs out:
+        # short exchanges keep more context, long-winded ones stay bounded
+        trimmed_dialog_history = []
+        budget = HISTORY_TOKEN_BUDGET
+        for turn in reversed(game_state.dialog_history):
+            cost = len(turn.content) // _CHARS_PER_TOKEN + _TURN_TOKEN_OVERHEAD
+            if trimmed_dialog_history and cost > budget:
+                break
+            budget -= cost
+            trimmed_dialog_history.append(turn)
+        trimmed_dialog_history.reverse()
         context = {
             "current_state": {
                 "suspicion_level": game_state.suspicion_level,
+                "history_summary": game_state.history_summary,
                 "dialog_history": trimmed_dialog_history,
                 "achievements": game_state.achievement_names,
-                "npcs": [npc.model_dump() for npc in game_state.npcs],
                 "dialog_exchanges_count": game_state.dialog_exchanges_count,
             },
             "user_input": dialog_input.to_dict(),
@@ -1,9 +1,19 @@
-from typing import Optional, List, Dict, Any
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional, List, Deque, Dict, Any
 from enum import Enum
-from pydantic import BaseModel, Field, model_serializer
+
+import numpy as np
+import orjson
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+# How many raw dialog turns to keep; older turns are folded into a summary
+DIALOG_HISTORY_WINDOW = 16
 
 
 class Achievement(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str
     description: str
 
@@ -15,28 +25,83 @@ class EndingType(Enum):
 
 
 class NPC(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: str
     description: str
     role: str
 
 
+@dataclass(slots=True)
+class DialogTurn:
+    """One turn of dialog; slots keep the per-turn footprint small compared
+    to a plain dict, and orjson serializes dataclasses natively"""
+
+    role: str
+    content: str
+    npc_id: Optional[str] = None
+
+
 class GameState(BaseModel):
     """Game state model to track progress and character states"""
 
     game_id: str
     game_over: bool = False
     achievements: List[Achievement] = Field(default_factory=list)
-    dialog_history: List[Dict[str, str]] = Field(default_factory=list)
+    dialog_history: Deque[DialogTurn] = Field(default_factory=deque)
+    history_summary: str = ""  # Rolling summary of turns evicted from the window
     suspicion_level: int = 5  # 0 to 10
     npcs: List[NPC] = Field(default_factory=list)
     dialog_exchanges_count: int = 0  # Count of dialog exchanges between user and system
 
+    # Serialized roster cache; the roster changes at most a few times per
+    # session while the dump is needed on every LLM call
+    _npcs_dump_cache: Optional[List[Dict[str, Any]]] = PrivateAttr(default=None)
+    # Cached NPC id set for O(1) membership checks on new-NPC dedupe
+    _npc_ids_cache: Optional[set] = PrivateAttr(default=None)
+
     @property
     def achievement_names(self) -> List[str]:
         return [ach.name for ach in self.achievements]
 
+    def npcs_dump(self) -> List[Dict[str, Any]]:
+        """
+        Serialized NPC roster, cached until invalidate_npcs_dump is called.
+
+        Only id and description are included: role is design metadata already
+        covered by the system prompt, and sending it per turn wastes tokens
+        """
+        if self._npcs_dump_cache is None:
+            self._npcs_dump_cache = [
+                {"id": npc.id, "description": npc.description} for npc in self.npcs
+            ]
+        return self._npcs_dump_cache
+
+    def npc_ids(self) -> set:
+        """Set of roster NPC ids, cached until invalidate_npcs_dump is called"""
+        if self._npc_ids_cache is None:
+            self._npc_ids_cache = {npc.id for npc in self.npcs}
+        return self._npc_ids_cache
+
+    def invalidate_npcs_dump(self):
+        """Drop the cached roster dump and id set after mutating self.npcs"""
+        self._npcs_dump_cache = None
+        self._npc_ids_cache = None
+
+    def append_dialog(self, entry: DialogTurn):
+        """
+        Append a dialog turn, folding the oldest turns into the rolling
+        summary once the window is full so memory stays bounded
+        """
+        while len(self.dialog_history) >= DIALOG_HISTORY_WINDOW:
+            evicted = self.dialog_history.popleft()
+            self.history_summary += f"{evicted.role}: {evicted.content}\n"
+        self.dialog_history.append(entry)
+
 
 class NPCDialog(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     dialog: str
     npc_id: str
 
@@ -67,16 +132,10 @@ class GameResponse(BaseModel):
     achievements: List[Achievement] = Field(default_factory=list)  # Achievements that were unlocked
     analysis: Optional[str] = None  # Analysis of the game when it's over
 
-    @model_serializer
-    def serialize_model(self) -> Dict[str, Any]:
-        return {
-            "dialogs": [dialog.model_dump() for dialog in self.dialogs],
-            "suspicion_level": self.suspicion_level,
-            "game_over": self.game_over,
-            "ending_type": self.ending_type.value if self.ending_type else None,
-            "achievements": [ach.model_dump() for ach in self.achievements],
-            "analysis": self.analysis,
-        }
+
+# Core emotion attribute names, in a fixed order shared by normalization
+# and serialization
+CORE_EMOTIONS = ("angry", "disgust", "fear", "happy", "sad", "surprise", "neutral")
 
 
 class Emotions:
@@ -86,7 +145,22 @@ class Emotions:
     value is between 0 and 100
     """
 
-    def __init__(self, emotion_probs: dict):
+    __slots__ = CORE_EMOTIONS + (
+        "stability",
+        "transition_score",
+        "consistent_emotion",
+        "angry_variance",
+        "disgust_variance",
+        "fear_variance",
+        "happy_variance",
+        "sad_variance",
+        "surprise_variance",
+        "neutral_variance",
+        "_dominant",
+        "_volatility",
+    )
+
+    def __init__(self, emotion_probs: dict, pre_normalized: bool = False):
         # Core emotion probabilities
         self.angry: float = emotion_probs.get("angry", 0)
         self.disgust: float = emotion_probs.get("disgust", 0)
@@ -110,20 +184,24 @@ class Emotions:
         self.surprise_variance: float = emotion_probs.get("surprise_variance", 0)
         self.neutral_variance: float = emotion_probs.get("neutral_variance", 0)
 
-        self.normalize()
+        # Callers that normalize whole batches up front (DialogInput) skip
+        # the per-instance pass
+        if not pre_normalized:
+            self.normalize()
+
+        # All fields are fixed after construction, so the derived labels can
+        # be computed once instead of on every to_dict call
+        self._dominant: str = max(CORE_EMOTIONS, key=lambda k: getattr(self, k))
+        if self.stability >= 80 and self.transition_score <= 20:
+            self._volatility: str = "stable"
+        elif self.stability <= 40 or self.transition_score >= 60:
+            self._volatility = "volatile"
+        else:
+            self._volatility = "moderate"
 
     def get_dominant_emotion(self) -> str:
         """Get the most prominent emotion"""
-        emotions = {
-            "angry": self.angry,
-            "disgust": self.disgust,
-            "fear": self.fear,
-            "happy": self.happy,
-            "sad": self.sad,
-            "surprise": self.surprise,
-            "neutral": self.neutral,
-        }
-        return max(emotions.items(), key=lambda x: x[1])[0]
+        return self._dominant
 
     def get_emotion_volatility(self) -> str:
         """
@@ -132,46 +210,22 @@ class Emotions:
         Returns:
             String describing emotion consistency: 'stable', 'moderate', or 'volatile'
         """
-        if self.stability >= 80 and self.transition_score <= 20:
-            return "stable"
-        elif self.stability <= 40 or self.transition_score >= 60:
-            return "volatile"
-        else:
-            return "moderate"
+        return self._volatility
 
     def normalize(self):
         """Normalize emotion values to ensure they sum to 100.0"""
-        # Get all core emotion attributes excluding metadata and methods
-        emotion_values = {
-            k: v
-            for k, v in self.__dict__.items()
-            if not k.startswith("__")
-            and k
-            not in [
-                "stability",
-                "transition_score",
-                "consistent_emotion",
-                "angry_variance",
-                "disgust_variance",
-                "fear_variance",
-                "happy_variance",
-                "sad_variance",
-                "surprise_variance",
-                "neutral_variance",
-            ]
-        }
-        total = sum(emotion_values.values())
+        total = sum(getattr(self, k) for k in CORE_EMOTIONS)
 
         if total == 0:
             raise ValueError("Total sum of emotions is 0")
 
         # Normalize to percentages (0-100) and round to 1 decimal place
-        for k, v in emotion_values.items():
-            setattr(self, k, round((v / total) * 100, 1))
+        for k in CORE_EMOTIONS:
+            setattr(self, k, round((getattr(self, k) / total) * 100, 1))
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert emotions to dictionary format including advanced metrics"""
-        basic_emotions = {
+        return {
             "angry": self.angry,
             "disgust": self.disgust,
             "fear": self.fear,
@@ -179,20 +233,13 @@ class Emotions:
             "sad": self.sad,
             "surprise": self.surprise,
             "neutral": self.neutral,
-        }
-
-        # Add advanced metrics
-        metrics = {
             "stability": self.stability,
             "transition_score": self.transition_score,
             "consistent_emotion": self.consistent_emotion,
-            "dominant_emotion": self.get_dominant_emotion(),
-            "volatility": self.get_emotion_volatility(),
+            "dominant_emotion": self._dominant,
+            "volatility": self._volatility,
         }
 
-        # Combine all data
-        return {**basic_emotions, **metrics}
-
 
 class DialogInput:
     """Class representing the extracted dialog and emotions from a video"""
@@ -212,27 +259,52 @@ class DialogInput:
         self.start_times: List[float] = []
         self.end_times: List[float] = []
 
+        # Normalize the core probabilities of every frame in one vectorized
+        # pass over an (N, 7) matrix instead of N per-instance Python loops
+        if emotion_results:
+            probs = np.array(
+                [
+                    [entry["emotions"].get(k, 0) for k in CORE_EMOTIONS]
+                    for entry in emotion_results
+                ],
+                dtype=np.float32,
+            )
+            totals = probs.sum(axis=1, keepdims=True)
+            if not totals.all():
+                raise ValueError("Total sum of emotions is 0")
+            normalized = np.round(probs / totals * 100, 1).tolist()
+
         # Process emotion results
-        for entry in emotion_results:
-            self.emotions.append(Emotions(entry["emotions"]))
+        for i, entry in enumerate(emotion_results):
+            emotion_probs = {**entry["emotions"], **dict(zip(CORE_EMOTIONS, normalized[i]))}
+            self.emotions.append(Emotions(emotion_probs, pre_normalized=True))
             self.sentences.append(entry["text"])
             self.mid_timestamps.append((entry["time"][0] + entry["time"][1]) / 2)
             self.start_times.append(entry["time"][0])
             self.end_times.append(entry["time"][1])
 
+        # Sentences never change after construction, so join them once here
+        # instead of on every consumer
+        self.text: str = "\n".join(self.sentences)
+        self._dict_cache: Optional[List[Dict[str, Any]]] = None
+
     def to_dict(self) -> List[Dict[str, Any]]:
-        """Convert dialog input to dictionary format"""
-        return [
+        """Convert dialog input to dictionary format (memoized; instances
+        are immutable after construction)"""
+        if self._dict_cache is not None:
+            return self._dict_cache
+        self._dict_cache = [
             {
-                "text": text,
-                "emotions": emotion.to_dict(),
-                "start_time": start,
-                "end_time": end,
+                "text": self.sentences[i],
+                "emotions": self.emotions[i].to_dict(),
+                "start_time": self.start_times[i],
+                "end_time": self.end_times[i],
             }
-            for text, emotion, start, end in zip(
-                self.sentences,
-                self.emotions,
-                self.start_times,
-                self.end_times,
-            )
+            for i in range(len(self.sentences))
         ]
+        return self._dict_cache
+
+    def to_json(self) -> bytes:
+        """Serialize the dialog input straight to JSON bytes with orjson,
+        skipping any framework-level encoder pass"""
+        return orjson.dumps(self.to_dict())
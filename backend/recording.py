@@ -83,7 +83,7 @@ class RecordingManager:
         target_path = os.path.join(recording_dir, f"video.webm")
         try:
             shutil.copy2(file_path, target_path)
-            logger.info(f"Copied uploaded file to {target_path}")
+            logger.info("Copied uploaded file to %s", target_path)
 
             return RecordingResult(
                 game_id=game_id,
@@ -91,7 +91,7 @@ class RecordingManager:
                 file_path=target_path,
             )
         except Exception as e:
-            logger.error(f"Error handling uploaded file: {str(e)}")
+            logger.error("Error handling uploaded file: %s", e)
             return RecordingResult(
                 game_id=game_id,
                 recording_id=recording_id,
@@ -119,7 +119,7 @@ class RecordingManager:
                 if os.path.exists(game_dir):
                     shutil.rmtree(game_dir)
 
-                logger.info(f"Cleaned up recording resources for game {game_id}")
+                logger.info("Cleaned up recording resources for game %s", game_id)
             else:
                 # Clean up all resources
                 self.recording_counters.clear()
@@ -134,4 +134,4 @@ class RecordingManager:
 
                 logger.info("Cleaned up all recording resources")
         except Exception as e:
-            logger.error(f"Error during cleanup: {str(e)}")
+            logger.error("Error during cleanup: %s", e)
@@ -0,0 +1,97 @@
+import logging
+import os
+from typing import Dict, List, Optional
+
+from models import GameState
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis
+    import redis.asyncio
+except ImportError:
+    redis = None
+
+
+class SessionStore:
+    """
+    Store for active game sessions.
+
+    Backed by Redis when REDIS_URL is set (so session state survives restarts
+    and can be shared by multiple uvicorn workers), falling back to an
+    in-process dict otherwise. WebSocket connections always stay local to the
+    worker that accepted them, so anything holding a socket must live on the
+    worker and only the serializable GameState goes through the store.
+
+    All accessors are async: the Redis backend uses redis.asyncio, so a
+    session lookup never blocks the event loop. The in-memory backend
+    completes immediately.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, ttl_seconds: int = 3600):
+        """
+        Initialize the session store
+
+        Args:
+            redis_url: Redis connection URL. Defaults to the REDIS_URL env var.
+            ttl_seconds: Expiry for stored sessions so abandoned games
+                don't accumulate in Redis.
+        """
+        redis_url = redis_url or os.getenv("REDIS_URL")
+        self.ttl_seconds = ttl_seconds
+        self._sessions: Dict[str, GameState] = {}
+        self._redis = None
+
+        if redis_url and redis is not None:
+            try:
+                # One-off sync ping at startup so an unreachable Redis falls
+                # back to the in-memory store instead of failing on first use;
+                # all per-request traffic goes through the async client below
+                redis.Redis.from_url(redis_url).ping()
+                self._redis = redis.asyncio.Redis.from_url(redis_url, decode_responses=True)
+                logger.info("Session store initialized with Redis backend")
+            except Exception as e:
+                logger.error("Could not connect to Redis (%s), using in-memory store", e)
+                self._redis = None
+
+        if self._redis is None:
+            logger.info("Session store initialized with in-memory backend")
+
+    def _key(self, game_id: str) -> str:
+        return f"game:{game_id}"
+
+    async def get(self, game_id: str) -> Optional[GameState]:
+        """Get the game state for a specific game ID, or None if not found"""
+        if self._redis is not None:
+            raw = await self._redis.get(self._key(game_id))
+            return GameState.model_validate_json(raw) if raw else None
+        return self._sessions.get(game_id)
+
+    async def set(self, game_id: str, game_state: GameState):
+        """Save the game state for a specific game ID"""
+        if self._redis is not None:
+            await self._redis.set(
+                self._key(game_id), game_state.model_dump_json(), ex=self.ttl_seconds
+            )
+        else:
+            self._sessions[game_id] = game_state
+
+    async def pop(self, game_id: str, default=None) -> Optional[GameState]:
+        """Remove and return the game state for a specific game ID"""
+        if self._redis is not None:
+            raw = await self._redis.getdel(self._key(game_id))
+            return GameState.model_validate_json(raw) if raw else default
+        return self._sessions.pop(game_id, default)
+
+    async def keys(self) -> List[str]:
+        """List the IDs of all active game sessions"""
+        if self._redis is not None:
+            prefix = self._key("")
+            return [key[len(prefix) :] async for key in self._redis.scan_iter(f"{prefix}*")]
+        return list(self._sessions.keys())
+
+    async def contains(self, game_id: str) -> bool:
+        """Whether a session exists for this game ID"""
+        if self._redis is not None:
+            return bool(await self._redis.exists(self._key(game_id)))
+        return game_id in self._sessions
@@ -1,5 +1,8 @@
+import concurrent.futures
 import os
 
+import numpy as np
+
 from moviepy import VideoFileClip
 from recording import RecordingManager, RecordingResult
 import whisper
@@ -23,19 +26,51 @@ if not logger.handlers:
     logger.addHandler(handler)
 
 
+# VideoProcessor used inside pool workers, created once per worker process
+_worker_processor = None
+
+
+def _init_video_worker():
+    """Warm up a VideoProcessor (and its models) inside a pool worker"""
+    global _worker_processor
+    _worker_processor = VideoProcessor(use_process_pool=False)
+
+
+def _process_video_task(video_path: str):
+    """Entry point executed in a pool worker for one video"""
+    if _worker_processor is None:
+        _init_video_worker()
+    return _worker_processor._process_video_impl(video_path)
+
+
 class VideoProcessor:
     """Main class for processing video files and extracting dialog and emotions"""
 
-    def __init__(self, output_folder: str = "recordings"):
+    # Process pool shared by all VideoProcessor instances so concurrent
+    # recordings decode and run emotion detection on separate cores
+    _video_pool = None
+
+    def __init__(self, output_folder: str = "recordings", use_process_pool: bool = True):
         """
         Initialize the video processor
 
         Args:
             output_folder: Directory where extracted frames will be saved
+            use_process_pool: Run process_video in a shared process pool
+                instead of the calling process
         """
         self.output_folder = output_folder
+        self.use_process_pool = use_process_pool
         os.makedirs(output_folder, exist_ok=True)
 
+    @classmethod
+    def _get_pool(cls) -> concurrent.futures.ProcessPoolExecutor:
+        if cls._video_pool is None:
+            cls._video_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=os.cpu_count(), initializer=_init_video_worker
+            )
+        return cls._video_pool
+
     def validate_video(self, video_path: str) -> bool:
         """
         Validate that the video file exists and can be read
@@ -668,27 +703,26 @@ class VideoProcessor:
 
             # Process results only if we have enough valid data
             if len(emotion_probs_all) >= 2:
-                # Calculate weighted average emotions
-                all_emotions = set().union(*[d.keys() for d in emotion_probs_all])
-                total_weight = sum(confidence_weights)
+                # Calculate weighted average emotions as one vectorized
+                # reduction over a (frames x emotions) matrix instead of a
+                # Python loop per emotion
+                all_emotions = sorted(set().union(*[d.keys() for d in emotion_probs_all]))
+                probs_matrix = np.array(
+                    [[d.get(e, 0.0) for e in all_emotions] for d in emotion_probs_all],
+                    dtype=np.float64,
+                )
+                weights = np.asarray(confidence_weights, dtype=np.float64)
+                total_weight = float(weights.sum())
 
                 if total_weight > 0:
-                    # Compute weighted average emotions
-                    weighted_avg = {
-                        emotion: sum(
-                            d.get(emotion, 0) * weight
-                            for d, weight in zip(emotion_probs_all, confidence_weights)
-                        )
-                        / total_weight
-                        for emotion in all_emotions
-                    }
+                    # Confidence-weighted average per emotion column
+                    avg = probs_matrix.T @ weights / total_weight
 
                     # Normalize to ensure they sum to 100
-                    total = sum(weighted_avg.values())
+                    total = float(avg.sum())
                     if total > 0:
-                        weighted_avg = {
-                            k: round((v / total) * 100, 1) for k, v in weighted_avg.items()
-                        }
+                        avg = np.round(avg / total * 100, 1)
+                    weighted_avg = dict(zip(all_emotions, avg.tolist()))
 
                     # Emotion stability analysis
                     emotion_stability = self._calculate_emotion_stability(emotion_probs_all)
@@ -851,22 +885,17 @@ class VideoProcessor:
             )
 
         # Get all unique emotions
-        all_emotions = set().union(*[d.keys() for d in emotion_probs_list])
+        all_emotions = sorted(set().union(*[d.keys() for d in emotion_probs_list]))
 
-        # Calculate variance for each emotion
-        variances = {}
-        for emotion in all_emotions:
-            # Extract values for this emotion across all frames
-            values = [d.get(emotion, 0) for d in emotion_probs_list]
-
-            # Calculate variance
-            mean = sum(values) / len(values)
-            variance = sum((x - mean) ** 2 for x in values) / len(values)
-
-            # Store normalized variance (0-100 scale)
-            variances[emotion] = round(min(variance * 10, 100), 1)  # Scale and cap at 100
+        # Population variance of every emotion column in one vectorized pass,
+        # scaled to 0-100 and capped
+        values = np.array(
+            [[d.get(e, 0.0) for e in all_emotions] for d in emotion_probs_list],
+            dtype=np.float64,
+        )
+        variances = np.round(np.minimum(values.var(axis=0) * 10, 100), 1)
 
-        return variances
+        return dict(zip(all_emotions, variances.tolist()))
 
     def _get_default_emotions(self) -> Dict[str, float]:
         """Return default emotion values when detection fails"""
@@ -899,6 +928,12 @@ class VideoProcessor:
         Returns:
             DialogInput object with extracted dialog and emotions
         """
+        if self.use_process_pool:
+            return self._get_pool().submit(_process_video_task, video_path).result()
+        return self._process_video_impl(video_path)
+
+    def _process_video_impl(self, video_path: str) -> DialogInput:
+        """Run the full transcription + emotion pipeline in this process"""
         if not os.path.exists(video_path):
             raise FileNotFoundError(f"Video file not found: {video_path}")
 
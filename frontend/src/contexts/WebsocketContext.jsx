@@ -29,7 +29,18 @@ export const WebsocketProvider = ({ children }) => {
     ws.onmessage = (event) => {
       const data = JSON.parse(event.data);
 
-      if (data.dialog) {
+      if (data.dialogs) {
+        // Batched NPC dialogs arrive as a single frame
+        setMessages((prev) => [
+          ...prev,
+          ...data.dialogs.map((d) => ({
+            type: 'dialog',
+            text: d.dialog,
+            npc_id: d?.npc_id ?? 'unknown',
+            suspicion_level: data?.suspicion_level ?? 0,
+          })),
+        ]);
+      } else if (data.dialog) {
         setMessages((prev) => [
           ...prev,
           {
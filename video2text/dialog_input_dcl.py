@@ -1,4 +1,5 @@
 from utils import transcribe_audio, extract_frames, detect_emotions
+import asyncio
 import os
 
 class Emotions:
@@ -21,13 +22,13 @@ class Emotions:
         Normalizes the emotions to percentages sum up to 1
         '''
         # Get all attributes that don't start with __
-        emotion_values = {k: v for k, v in self.__dict__.items() 
+        emotion_values = {k: v for k, v in self.__dict__.items()
                          if not k.startswith('__')}
         total = sum(emotion_values.values())
-        
+
         if total == 0:
             raise ValueError("Total sum of emotions is 0")
-            
+
         # Normalize to percentages
         for k, v in emotion_values.items():
             setattr(self, k, (v/total))
@@ -39,7 +40,8 @@ class DialogInputDCL:
     '''
     def __init__(self,
                  video_file: str = "sample_video.mp4",
-                 frames_per_sentence: int = 3
+                 frames_per_sentence: int = 3,
+                 _run_pipeline: bool = True
                  ):
         self.emotions: list[Emotions] = []
         self.sentences: list[str] = []
@@ -48,13 +50,46 @@ class DialogInputDCL:
         self.end_times: list[float] = []
         self.video_file: str = video_file
         self.frames_per_sentence: int = frames_per_sentence
-        self.get_dialog_input(video_file)
+        if _run_pipeline:
+            self.get_dialog_input(video_file)
 
+    @classmethod
+    async def create(cls,
+                     video_file: str = "sample_video.mp4",
+                     frames_per_sentence: int = 3
+                     ) -> "DialogInputDCL":
+        '''
+        Async constructor for use from an event loop.
+        Runs each pipeline stage (whisper, frame extraction, DeepFace) in a
+        worker thread so the loop is never blocked. The stages stay sequential
+        because each one consumes the previous stage's output.
+        '''
+        self = cls(video_file, frames_per_sentence, _run_pipeline=False)
+        resolved = self._resolve_video_path(video_file)
+        segments = await asyncio.to_thread(transcribe_audio, resolved)
+        frames = await asyncio.to_thread(extract_frames, resolved, segments, frames_per_sentence)
+        emotions = await asyncio.to_thread(detect_emotions, frames)
+        self._populate(emotions)
+        return self
 
     def get_dialog_input(self, file_path: str):
         '''
         Extracts emotions and sentences from a video file.
         '''
+        video_file = self._resolve_video_path(file_path)
+        # Transcribe audio. This also determines the timestamps of the sentences.
+        segments = transcribe_audio(video_file)
+        # Extract frames from the segments.
+        frames = extract_frames(video_file, segments, self.frames_per_sentence)
+        # Detect emotions from the frames. These are probabilities, stored in Emotions objects.
+        emotions = detect_emotions(frames)
+        self._populate(emotions)
+
+    @staticmethod
+    def _resolve_video_path(file_path: str) -> str:
+        '''
+        Resolves a relative path against the script location and checks it exists.
+        '''
         if not os.path.isabs(file_path):
             # If relative path is provided, make it absolute relative to script location
             video_file = os.path.join(os.path.dirname(__file__), file_path)
@@ -63,19 +98,15 @@ class DialogInputDCL:
 
         if not os.path.exists(video_file):
             raise FileNotFoundError(f"Video file not found: {video_file}")
-        # Transcribe audio. This also determines the timestamps of the sentences.
-        segments = transcribe_audio(video_file)
-        # Extract frames from the segments.
-        frames = extract_frames(video_file, segments, self.frames_per_sentence)
-        # Detect emotions from the frames. These are probabilities, stored in Emotions objects.
-        emotions = detect_emotions(frames)
+        return video_file
 
-        # Populate the dataclass with the emotions and sentences.
+    def _populate(self, emotions: list[dict]):
+        '''
+        Populates the dataclass with the emotions and sentences.
+        '''
         for entry in emotions:
             self.emotions.append(Emotions(entry['emotions']))
             self.sentences.append(entry['text'])
             self.mid_timestamps.append((entry['time'][0] + entry['time'][1]) / 2)
             self.start_times.append(entry['time'][0])
             self.end_times.append(entry['time'][1])
-
-